@@ -1,10 +1,14 @@
 import numpy as np
 import pandas as pd
 import yaml
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 from datetime import datetime, timedelta
-from joblib import delayed, Parallel
 import xarray as xr
 import glob
+import os
 import pathlib
 
 import logging
@@ -90,11 +94,7 @@ class DAforcing_model():
             nts = compute_parameters.get('forcing_parameters').get('nts')
             timeslice_start = start_datetime - timedelta(hours=lookback_hrs)
             timeslice_end = start_datetime + timedelta(seconds=dt*nts)
-            delta = timedelta(minutes=15)
-            timeslice_dates = []
-            while timeslice_start <= timeslice_end:
-                timeslice_dates.append(timeslice_start.strftime('%Y-%m-%d_%H:%M:%S'))
-                timeslice_start += delta
+            timeslice_dates = pd.date_range(timeslice_start, timeslice_end, freq='15min').strftime('%Y-%m-%d_%H:%M:%S').tolist()
             
             # Create empty default dataframes:
             self._usgs_df = pd.DataFrame()
@@ -106,25 +106,28 @@ class DAforcing_model():
             # USGS Observations
             if nudging or usgs_persistence:
                 usgs_timeslice_path = str(data_assimilation_parameters.get('usgs_timeslices_folder'))
+                # timeslice observations are read time x station; .T gives the
+                # station x time frames (a view, not a copy)
                 if nudging:
-                    self._usgs_df = _read_timeslice_files(usgs_timeslice_path,
-                                                          timeslice_dates,
-                                                          qc_threshold,
-                                                          dt,
-                                                          cpu_pool,)
-                    self._reservoir_usgs_df = (
-                        self._usgs_df.
-                        transpose().
-                        resample('15min').asfreq().
-                        transpose()
-                        )
+                    usgs_df_T = _read_timeslice_files(usgs_timeslice_path,
+                                                      timeslice_dates,
+                                                      qc_threshold,
+                                                      dt,
+                                                      cpu_pool,)
+                    self._usgs_df = usgs_df_T.T
+                    if not usgs_df_T.empty:
+                        # select the 15 minute rows directly rather than resampling
+                        dates = usgs_df_T.index
+                        self._reservoir_usgs_df = usgs_df_T.reindex(
+                            pd.date_range(dates[0].floor('15min'), dates[-1], freq='15min', name=dates.name)
+                            ).T
                 else:
                     self._usgs_df = pd.DataFrame()
                     self._reservoir_usgs_df = _read_timeslice_files(usgs_timeslice_path,
                                                                     timeslice_dates,
                                                                     qc_threshold,
                                                                     900, #15 minutes
-                                                                    cpu_pool,)
+                                                                    cpu_pool,).T
 
             # USACE Observations        
             if usace_persistence:
@@ -133,7 +136,7 @@ class DAforcing_model():
                                                                  timeslice_dates,
                                                                  qc_threshold,
                                                                  900, #15 minutes
-                                                                 cpu_pool,)
+                                                                 cpu_pool,).T
 
             # Produce list of datetimes to search for timeseries files
             rfc_parameters = data_assimilation_parameters.get('reservoir_da', {}).get('reservoir_rfc_da', {})
@@ -141,11 +144,7 @@ class DAforcing_model():
             offset_hrs = rfc_parameters.get('reservoir_rfc_forecasts_offset_hours')
             timeseries_end = start_datetime + timedelta(hours=offset_hrs)
             timeseries_start = timeseries_end - timedelta(hours=lookback_hrs)
-            delta = timedelta(hours=1)
-            timeseries_dates = []
-            while timeseries_start <= timeseries_end:
-                timeseries_dates.append(timeseries_start.strftime('%Y-%m-%d_%H'))
-                timeseries_start += delta
+            timeseries_dates = pd.date_range(timeseries_start, timeseries_end, freq='h').strftime('%Y-%m-%d_%H').tolist()
             rfc_forecast_persist_days = rfc_parameters.get('reservoir_rfc_forecast_persist_days')
             final_persist_datetime = start_datetime + timedelta(days=rfc_forecast_persist_days)
 
@@ -458,7 +457,7 @@ def _read_config_file(custom_input_file):
 
     '''
     with open(custom_input_file) as custom_file:
-        data = yaml.load(custom_file, Loader=yaml.SafeLoader)
+        data = yaml.load(custom_file, Loader=SafeLoader)
 
     troute_configuration = Config(**data)
     config_dict = troute_configuration.dict()
@@ -484,129 +483,207 @@ def _read_timeslice_files(filepath,
                           cpu_pool=1,
                           interpolation_limit=59,
                           ):
+    # List the directory once and look up each date's file by its name prefix,
+    # rather than globbing the directory for every date
+    timeslice_files = {}
+    if os.path.isdir(filepath):
+        with os.scandir(filepath) as entries:
+            for entry in entries:
+                timeslice_files.setdefault(entry.name.split('.')[0], entry.path)
+
     #Read files
-    observation_df = pd.DataFrame()
-    for d in dates:
-        f = glob.glob(filepath + '/' + d + '*')
+    frames = [_open_one_timeslice(timeslice_files[d]) for d in dates if d in timeslice_files]
 
-        if f:
-            temp_df = xr.open_dataset(f[0])[['stationId','time','discharge','discharge_quality']].to_dataframe()
-            observation_df = pd.concat([observation_df, temp_df])
+    if frames:
+        observation_df = pd.concat(frames, ignore_index=True, copy=False, sort=False)
+    else:
+        observation_df = pd.DataFrame()
 
     if not observation_df.empty:
-        observation_df['stationId'] = observation_df['stationId'].str.decode('utf-8').str.strip()
-        observation_df['time'] = observation_df['time'].str.decode('utf-8')
+        # strip/decode the fixed-width byte strings in C rather than through the .str accessor
+        observation_df['stationId'] = pd.Categorical(
+            np.char.strip(observation_df['stationId'].to_numpy().astype(bytes)).astype(str)
+        )
+        observation_df['time'] = pd.to_datetime(
+            observation_df['time'].to_numpy().astype(bytes).astype(str), format = "%Y-%m-%d_%H:%M:%S"
+        )
         observation_df['discharge_quality'] = observation_df['discharge_quality']/100
 
         #QC/QA and interpolation
-        observation_df.loc[observation_df['discharge_quality']<0, 'discharge'] = np.nan
-        observation_df.loc[observation_df['discharge_quality']>1, 'discharge'] = np.nan
-        observation_df.loc[observation_df['discharge_quality']<qc_threshold, 'discharge'] = np.nan
-        observation_df.loc[observation_df['discharge']<=0, 'discharge'] = np.nan
+        quality = observation_df['discharge_quality'].to_numpy()
+        discharge = observation_df['discharge'].to_numpy(copy=True)
+        bad = (quality < qc_threshold) | (quality > 1) | (quality < 0) | (discharge <= 0)
+        discharge[bad] = np.nan
+        observation_df['discharge'] = discharge
 
-        observation_df = observation_df[['stationId','time','discharge']].set_index(['stationId', 'time']).unstack(1, fill_value = np.nan)['discharge']
+        # pivot to time x station; hashing the categorical codes is cheaper than the id strings
+        observation_df_T = observation_df.pivot(index = 'time', columns = 'stationId', values = 'discharge')
+        observation_df_T.columns = observation_df_T.columns.astype(str)
 
         # ---- Interpolate USGS observations to the input frequency (frequency_secs)
-        observation_df_T = observation_df.transpose()             # transpose, making time the index
-        observation_df_T.index = pd.to_datetime(
-            observation_df_T.index, format = "%Y-%m-%d_%H:%M:%S"  # index variable as type datetime
-        )
-        
         # specify resampling frequency 
         frequency = str(int(frequency_secs/60))+"min"    
 
         # interpolate and resample frequency
-        buffer_df = observation_df_T.resample(frequency).asfreq()
-        with Parallel(n_jobs=cpu_pool) as parallel:
-            
-            jobs = []
-            interp_chunks = ()
-            step = 200
-            for a, i in enumerate(range(0, len(observation_df_T.columns), step)):
-                
-                start = i
-                if (i+step-1) < buffer_df.shape[1]:
-                    stop = i+(step)
-                else:
-                    stop = buffer_df.shape[1]
-                    
-                jobs.append(
-                    delayed(_interpolate_one)(observation_df_T.iloc[:,start:stop], interpolation_limit, frequency)
-                )
-                
-            interp_chunks = parallel(jobs)
-
-        observation_df_T = pd.DataFrame(
-            data = np.concatenate(interp_chunks, axis = 1), 
-            columns = buffer_df.columns, 
-            index = buffer_df.index
-        )
-        
-        # re-transpose, making link the index
-        observation_df_new = observation_df_T.transpose()
+        observation_df_T = _interpolate_timeslices(observation_df_T, interpolation_limit, frequency)
+        observation_df_T.columns.name = 'stationId'
     
     else:
-        observation_df_new = pd.DataFrame()
+        observation_df_T = pd.DataFrame()
 
-    return observation_df_new
+    # time is the index and stations are the columns
+    return observation_df_T
 
-def _interpolate_one(df, interpolation_limit, frequency):
+def _open_one_timeslice(f):
+    # Time decoding and masking are skipped; the QC step handles fill values itself.
+    with xr.open_dataset(f, decode_times=False, mask_and_scale=False) as ds:
+        df = ds[['stationId','time','discharge','discharge_quality']].to_dataframe()
+
+    # pin the discharge dtype per file so the frames concatenate without dtype reconciliation
+    return df.astype({'discharge': np.float32}, copy=False)
+
+def _interpolate_timeslices(df, interpolation_limit, frequency):
+    '''
+    Linearly interpolate observations onto a regular time grid. Equivalent to
+    df.resample('min').interpolate(limit=interpolation_limit, limit_direction='both')
+    followed by .resample(frequency).asfreq(), but evaluated at the output
+    times only rather than materializing the 1-minute frame.
     
-    interp_out = (df.resample('min').
-                        interpolate(
-                            limit = interpolation_limit, 
-                            limit_direction = 'both'
-                        ).
-                        resample(frequency).
-                        asfreq().
-                        to_numpy()
-                       )
-    return interp_out
+    Arguments
+    ---------
+    df                  (DataFrame): observations, datetime index x station columns
+    interpolation_limit       (int): max number of minutes filled from either end of a gap
+    frequency                 (str): output frequency, e.g. '5min'
+    
+    Returns
+    -------
+    (DataFrame): interpolated observations, datetime index at frequency x station columns
+    '''
+    one_minute = pd.Timedelta(minutes=1)
+    times = df.index
+    start = times[0].floor('min')
+
+    # only observations that fall on a whole minute are kept by the 1-minute resample
+    on_minute = times == times.floor('min')
+    obs_minutes = np.asarray((times[on_minute] - start) // one_minute)
+    values = df.to_numpy(dtype=np.float64)[on_minute]
+    n_obs, n_stations = values.shape
+
+    out_index = pd.DataFrame(index=times).resample(frequency).asfreq().index
+    out_minutes = np.asarray((out_index - start) // one_minute)[:, None]
+
+    if n_obs == 0:
+        return pd.DataFrame(np.nan, index = out_index, columns = df.columns, dtype = np.result_type(*df.dtypes))
+
+    # row of the nearest valid observation at or before/after each observation row,
+    # padded so that -1 and n_obs flag the absence of one
+    valid = ~np.isnan(values)
+    rows = np.arange(n_obs)[:, None]
+    prev_row = np.maximum.accumulate(np.where(valid, rows, -1), axis=0)
+    next_row = np.minimum.accumulate(np.where(valid, rows, n_obs)[::-1], axis=0)[::-1]
+    prev_row = np.vstack([np.full((1, n_stations), -1), prev_row])
+    next_row = np.vstack([next_row, np.full((1, n_stations), n_obs)])
+
+    # nearest valid observation at or before/after each output time
+    prev_row = prev_row[np.searchsorted(obs_minutes, out_minutes[:, 0], side='right')]
+    next_row = next_row[np.searchsorted(obs_minutes, out_minutes[:, 0], side='left')]
+    has_prev = prev_row >= 0
+    has_next = next_row < n_obs
+    prev_row = np.clip(prev_row, 0, n_obs - 1)
+    next_row = np.clip(next_row, 0, n_obs - 1)
+    columns = np.arange(n_stations)
+    prev_value = values[prev_row, columns]
+    next_value = values[next_row, columns]
+
+    prev_minute = obs_minutes[prev_row]
+    next_minute = obs_minutes[next_row]
+    span = next_minute - prev_minute
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (next_value - prev_value) / span
+        interior = np.where(span > 0, slope * (out_minutes - prev_minute) + prev_value, prev_value)
+
+    # leading and trailing gaps hold the nearest value; a gap is only filled within
+    # interpolation_limit minutes of a valid observation
+    out = np.where(has_prev & has_next, interior, np.where(has_prev, prev_value, next_value))
+    fill = (
+        (has_prev & (out_minutes - prev_minute <= interpolation_limit))
+        | (has_next & (next_minute - out_minutes <= interpolation_limit))
+    ) & (out_minutes >= 0)
+    out[~fill] = np.nan
+
+    return pd.DataFrame(
+        data = out.astype(np.result_type(*df.dtypes), copy=False),
+        index = out_index,
+        columns = df.columns
+        )
 
 def _read_timeseries_files(filepath, timeseries_dates, t0, final_persist_datetime):
     # Search for most recent RFC timseries file based on offset hours and lookback window
     # for each location.
     files = glob.glob(filepath + '/*')
     # create temporary dataframe with file names, split up by location and datetime
-    df = pd.DataFrame([f.split('/')[-1].split('.') for f in files], columns=['Datetime','dt','ID','rfc','ext'])
+    # (<Datetime>.<dt>.<ID>.RFCTimeSeries.ncdf) in a single regex pass over the paths
+    df = pd.Series(files, dtype=object).str.extract(
+        r'(?P<Datetime>[^/.]+)\.[^/.]+\.(?P<ID>[^/.]+)\.[^/.]+\.[^/.]+$'
+    )
     df = df[df['Datetime'].isin(timeseries_dates)][['ID','Datetime']]
     # For each location, find the most recent timeseries file (within timeseries window calculated a priori)
-    df['Datetime'] = df['Datetime'].apply(lambda _: datetime.strptime(_, '%Y-%m-%d_%H'))
+    df['Datetime'] = pd.to_datetime(df['Datetime'], format='%Y-%m-%d_%H', cache=True)
     df = df.groupby('ID').max().reset_index()
     df['Datetime'] = df['Datetime'].dt.strftime('%Y-%m-%d_%H')
 
-    # Loop through list of timeseries files and store relevent information in dataframe.
+    # Read each timeseries file and store relevent information in dataframe.
     file_list = (df['Datetime'] + '.60min.' + df['ID'] + '.RFCTimeSeries.ncdf').tolist()
-    rfc_df = pd.DataFrame()
-    for f in file_list:
-        ds = xr.open_dataset(filepath + '/' + f)
+    frames = [_process_rfc_file(filepath, f, t0, final_persist_datetime) for f in file_list]
+
+    if not frames:
+        return pd.DataFrame()
+
+    rfc_df = pd.concat(frames, ignore_index=False, copy=False, sort=False)
+    rfc_df['stationId'] = np.char.strip(rfc_df['stationId'].to_numpy().astype(bytes)).astype(str)
+    return rfc_df
+
+def _process_rfc_file(filepath, f, t0, final_persist_datetime):
+    # Only convert the variables we use; the remaining ones are never read from disk. Time
+    # decoding is skipped except for timeSteps, which is decoded from its own units.
+    with xr.open_dataset(filepath + '/' + f, decode_times=False, decode_timedelta=True, mask_and_scale=False) as ds:
         sliceStartTime = datetime.strptime(ds.attrs.get('sliceStartTimeUTC'), '%Y-%m-%d_%H:%M:%S')
         sliceTimeResolutionMinutes = ds.attrs.get('sliceTimeResolutionMinutes')
-        df = ds.to_dataframe().reset_index().sort_values('forecastInd')[['stationId','discharges','synthetic_values','totalCounts','timeSteps']]
-        df['Datetime'] = pd.date_range(sliceStartTime, periods=df.shape[0], freq=sliceTimeResolutionMinutes+'T')
-        # Filter out forecasts that go beyond the rfc_persist_days parameter. This isn't necessary, but removes
-        # excess data, keeping the dataframe of observations as small as possible.
-        df = df[df['Datetime']<final_persist_datetime]
-        # Locate where t0 is in the timeseries
-        df['timeseries_idx'] = df.index[df.Datetime == t0][0]
-        df['file'] = f
-
-        # Validate data to determine whether or not it will be used.
-        use_rfc = _validate_RFC_data(
-            df['stationId'][0],
-            df.discharges,
-            df.synthetic_values,
-            filepath,
-            f,
-            300, #NOTE: this is t-route's default timestep. This will need to be verifiied again within t-route...
-            False
+        df = (
+            ds[['stationId','discharges','synthetic_values','totalCounts','timeSteps']].
+            to_dataframe().
+            reset_index()
         )
-        df['use_rfc'] = use_rfc
-        df['da_timestep'] = int(sliceTimeResolutionMinutes)*60
+    # forecastInd normally comes out in order already; only sort when it does not
+    if not df['forecastInd'].is_monotonic_increasing:
+        df = df.sort_values('forecastInd')
+    df = df[['stationId','discharges','synthetic_values','totalCounts','timeSteps']]
+    df = df.astype({'discharges': np.float32}, copy=False)
+    resolution = np.timedelta64(int(sliceTimeResolutionMinutes), 'm')
+    df['Datetime'] = (
+        np.datetime64(sliceStartTime, 's') + np.arange(df.shape[0], dtype='i8') * resolution
+    ).astype('datetime64[ns]')
+    # Filter out forecasts that go beyond the rfc_persist_days parameter. This isn't necessary, but removes
+    # excess data, keeping the dataframe of observations as small as possible.
+    df = df[df['Datetime']<final_persist_datetime]
+    # Locate where t0 is in the timeseries
+    df['timeseries_idx'] = df.index[df.Datetime == t0][0]
+    df['file'] = f
+
+    # Validate data to determine whether or not it will be used.
+    use_rfc = _validate_RFC_data(
+        df['stationId'][0],
+        df.discharges,
+        df.synthetic_values,
+        filepath,
+        f,
+        300, #NOTE: this is t-route's default timestep. This will need to be verifiied again within t-route...
+        False
+    )
+    df['use_rfc'] = use_rfc
+    df['da_timestep'] = int(sliceTimeResolutionMinutes)*60
 
-        rfc_df = pd.concat([rfc_df, df])
-    rfc_df['stationId'] = rfc_df['stationId'].str.decode('utf-8').str.strip()
-    return rfc_df
+    return df
 
 def _read_lastobs_file(
         lastobsfile,
@@ -617,35 +694,28 @@ def _read_lastobs_file(
         discharge_nan = -9999.0,
         time_shift = 0,
         ):
-    with xr.open_dataset(lastobsfile) as ds:
+    with xr.open_dataset(lastobsfile, decode_times=False, mask_and_scale=False) as ds:
         gages = ds[station_id].values
         
         ref_time = datetime.strptime(ds.attrs[ref_t_attr_id], "%Y-%m-%d_%H:%M:%S")
         
         last_ts = ds[time_idx_id].values[-1]
         
-        df_discharge = (
-            ds[obs_discharge_id].to_dataframe().                 # discharge to MultiIndex DF
-            replace(to_replace = discharge_nan, value = np.nan). # replace null values with nan
-            unstack(level = 0)                                   # unstack to single Index (timeInd)    
-        )
+        discharge = ds[obs_discharge_id].transpose(..., time_idx_id).values.copy()  # gages x timeInd, native dtype
+        discharge[discharge == discharge_nan] = np.nan                              # replace null values with nan
         
-        last_obs_index = (
-            df_discharge.
-            apply(pd.Series.last_valid_index).                   # index of last non-nan value, each gage
-            to_numpy()                                           # to numpy array
-        )
-        last_obs_index = np.nan_to_num(last_obs_index, nan = last_ts).astype(int)
-                        
-        last_observations = []
-        lastobs_times     = []
-        for i, idx in enumerate(last_obs_index):
-            last_observations.append(df_discharge.iloc[idx,i])
-            lastobs_times.append(ds.time.values[i, idx].decode('utf-8'))
+        # index of last non-nan value, each gage: first valid value scanning each row backwards.
+        # Gages with no observations fall back to last_ts
+        valid = ~np.isnan(discharge)
+        last_obs_index = discharge.shape[1] - 1 - np.argmax(valid[:, ::-1], axis = 1)
+        last_obs_index[~valid.any(axis = 1)] = last_ts
+        
+        gage_index        = np.arange(discharge.shape[0])
+        last_observations = discharge[gage_index, last_obs_index]
+        lastobs_times     = np.char.decode(ds.time.values[gage_index, last_obs_index], 'utf-8')
             
-        last_observations = np.array(last_observations)
         lastobs_times     = pd.to_datetime(
-            np.array(lastobs_times), 
+            lastobs_times, 
             format="%Y-%m-%d_%H:%M:%S", 
             errors = 'coerce'
         )
@@ -767,15 +837,14 @@ def _write_lastobs(
     modelTimeAtOutput_str = modelTimeAtOutput.strftime('%Y-%m-%d_%H:%M:%S')
 
     # timestamp of last observation
-    var = [timedelta(seconds=d) for d in lastobs_df.time_since_lastobs.fillna(0)]
+    var = pd.to_timedelta(lastobs_df.time_since_lastobs.astype(float).fillna(0), unit='s')
     # shorvath (10/18/23): This code was copied from nhd_io.py based on V3 operations.
     # I changed 'modelTimeAtOutput - d' to 'modelTimeAtOutput + d' here because the '-' was
     # creating timestamps that are ahead of the model time which can't be right. I'm not sure
     # if this method was thoroughly checked for V3, but I've only made the update here.
     #TODO: Determine if this should also be changed in nhd_io.py...
-    lastobs_timestamp = [modelTimeAtOutput + d for d in var]
-    lastobs_timestamp_str = [d.strftime('%Y-%m-%d_%H:%M:%S') for d in lastobs_timestamp]
-    lastobs_timestamp_str_array = np.asarray(lastobs_timestamp_str,dtype = '|S19').reshape(len(lastobs_timestamp_str),1)
+    lastobs_timestamp = pd.Timestamp(modelTimeAtOutput) + pd.TimedeltaIndex(var)
+    lastobs_timestamp_str_array = lastobs_timestamp.strftime('%Y-%m-%d_%H:%M:%S').to_numpy(dtype = '|S19').reshape(-1,1)
     
     # create xarray Dataset similarly structured to WRF-generated lastobs netcdf files
     ds = xr.Dataset(
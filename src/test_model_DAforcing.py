@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from model_DAforcing import _interpolate_timeslices
+
+
+def _pandas_interpolate(df, interpolation_limit, frequency):
+    # reference implementation that _interpolate_timeslices replaces
+    return (
+        df.resample('min')
+        .interpolate(limit=interpolation_limit, limit_direction='both')
+        .resample(frequency)
+        .asfreq()
+    )
+
+def _observations(times, values):
+    values = np.asarray(values, dtype=np.float32)
+    return pd.DataFrame(
+        values.reshape(len(times), -1),
+        index = pd.DatetimeIndex(pd.to_datetime(times), name='time'),
+        columns = pd.Index(['s%d' % i for i in range(values.size // len(times))], name='stationId'),
+    )
+
+def _assert_matches_pandas(df, interpolation_limit, frequency):
+    expected = _pandas_interpolate(df, interpolation_limit, frequency)
+    result = _interpolate_timeslices(df, interpolation_limit, frequency)
+    pd.testing.assert_frame_equal(result, expected, check_freq=False, check_exact=True)
+
+@pytest.mark.parametrize('interpolation_limit', [1, 5, 59])
+@pytest.mark.parametrize('frequency', ['1min', '5min', '15min'])
+def test_leading_and_trailing_gaps(interpolation_limit, frequency):
+    df = _observations(
+        ['2021-08-23 00:00', '2021-08-23 00:15', '2021-08-23 00:30', '2021-08-23 00:45', '2021-08-23 01:00'],
+        [[np.nan, 1.0],
+         [2.0, np.nan],
+         [np.nan, 3.0],
+         [4.0, np.nan],
+         [np.nan, np.nan]],
+    )
+    _assert_matches_pandas(df, interpolation_limit, frequency)
+
+@pytest.mark.parametrize('frequency', ['1min', '5min', '15min'])
+def test_off_minute_timestamps(frequency):
+    # observations that are not on a whole minute are dropped by the 1-minute resample
+    df = _observations(
+        ['2021-08-23 00:00:00', '2021-08-23 00:07:30', '2021-08-23 00:15:00', '2021-08-23 00:22:30', '2021-08-23 00:30:00'],
+        [1.0, 100.0, 3.0, 100.0, 5.0],
+    )
+    _assert_matches_pandas(df, 59, frequency)
+
+@pytest.mark.parametrize('interpolation_limit', [1, 5, 59])
+def test_output_grid_starts_before_first_minute(interpolation_limit):
+    # the 5min output grid starts at 00:05, before the first observation at 00:07
+    df = _observations(
+        ['2021-08-23 00:07', '2021-08-23 00:22', '2021-08-23 00:37'],
+        [[1.0, np.nan], [2.0, 5.0], [3.0, 6.0]],
+    )
+    _assert_matches_pandas(df, interpolation_limit, '5min')
+
+@pytest.mark.parametrize('frequency', ['5min', '15min'])
+def test_all_nan_columns(frequency):
+    df = _observations(
+        ['2021-08-23 00:00', '2021-08-23 00:15', '2021-08-23 00:30'],
+        [[np.nan, 1.0, np.nan], [np.nan, 2.0, np.nan], [np.nan, 3.0, np.nan]],
+    )
+    _assert_matches_pandas(df, 59, frequency)
+    _assert_matches_pandas(df[['s0', 's2']], 59, frequency)
+
+@pytest.mark.parametrize('seed', range(20))
+def test_random_observations(seed):
+    rng = np.random.default_rng(seed)
+    n_obs = int(rng.integers(1, 40))
+    n_stations = int(rng.integers(1, 6))
+    step = int(rng.choice([1, 5, 7, 15]))
+    start = pd.Timestamp('2021-08-23') + pd.Timedelta(minutes=int(rng.integers(0, 30)))
+    minutes = np.sort(rng.choice(np.arange(n_obs * step * 3), size=n_obs, replace=False))
+    values = rng.random((n_obs, n_stations))
+    values[rng.random((n_obs, n_stations)) < rng.random()] = np.nan
+    df = _observations(start + pd.to_timedelta(minutes, unit='min'), values)
+    _assert_matches_pandas(df, int(rng.choice([1, 5, 59])), str(rng.choice(['1min', '5min', '15min', '60min'])))